@@ -0,0 +1,35 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session instance, created lazily by get_shared_session().
+_session = None
+
+def get_shared_session():
+    """
+    Returns a process-wide requests.Session configured for connection reuse.
+
+    Both spotipy and ytmusicapi accept a requests_session argument; handing
+    them this shared session means every paginated fetch and track search
+    reuses already-established TCP/TLS connections instead of paying a fresh
+    2-3 RTT handshake per request. Transient server errors and rate-limit
+    responses are retried at the transport level with backoff.
+
+    Returns:
+        requests.Session: The shared, connection-pooling session.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        session.mount('https://', adapter)
+        _session = session
+    return _session
@@ -1,12 +1,33 @@
 import os
+import tempfile
 import spotipy
+from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
 from spotipy.oauth2 import SpotifyOAuth
 
+from .http_session import get_shared_session
+
 # Define the scopes required for accessing Spotify playlist data.
 # 'playlist-read-private': Allows reading user's private playlists.
 # 'playlist-read-collaborative': Allows reading user's collaborative playlists.
 SCOPES = "playlist-read-private playlist-read-collaborative"
 
+# Module-level cache of authenticated clients, keyed on the credentials that
+# produced them. Building a SpotifyOAuth manager re-reads environment variables
+# and re-parses the on-disk token cache every time, so repeated logins from the
+# GUI would otherwise pay that disk I/O again for no benefit.
+_client_cache = {}
+
+# The in-memory/on-disk cache handler pair backing the active client.
+# Spotipy's default CacheFileHandler re-reads the cache file for every API
+# request; we keep the token in memory instead and only touch disk once at
+# startup (seed) and once at shutdown (write-back).
+_active_cache_handlers = None
+
+# On-disk location for the persisted token cache. The system temp directory
+# is typically on fast local storage (tmpfs on many Linux setups), unlike the
+# working directory which may live on a network share.
+TOKEN_CACHE_PATH = os.path.join(tempfile.gettempdir(), '.spotipy-token-cache')
+
 def get_spotify_client():
     """
     Authenticates with Spotify using credentials from environment variables
@@ -35,19 +56,75 @@ def get_spotify_client():
             "SPOTIPY_CLIENT_SECRET, and SPOTIPY_REDIRECT_URI environment variables."
         )
 
-    # The SpotifyOAuth object handles the OAuth 2.0 flow.
-    # It will automatically prompt the user for authorization if needed
-    # and cache the access token for future use.
+    # Return a previously built client if we already have one for these
+    # credentials. validate_token() refreshes an expired access token in place,
+    # so the cached client stays usable across the 1-hour token lifetime.
+    key = (client_id, redirect_uri, SCOPES)
+    cached_client = _client_cache.get(key)
+    if cached_client is not None:
+        auth_manager = cached_client.auth_manager
+        auth_manager.validate_token(auth_manager.cache_handler.get_cached_token())
+        return cached_client
+
+    # Seed an in-memory cache handler from the default on-disk cache so token
+    # lookups during the transfer loop are plain dict accesses rather than an
+    # open/read/json.loads per request. The disk file is only rewritten when
+    # save_spotify_token_cache() is called (e.g. on application shutdown).
+    global _active_cache_handlers
+    disk_handler = CacheFileHandler(cache_path=TOKEN_CACHE_PATH)
+    memory_handler = MemoryCacheHandler(token_info=disk_handler.get_cached_token())
+    _active_cache_handlers = (memory_handler, disk_handler)
+
+    # The SpotifyOAuth object handles the OAuth 2.0 flow. open_browser is
+    # left at its default so a genuinely cold login goes through spotipy's
+    # own interactive flow, including the local redirect server that
+    # catches the OAuth callback — opening the authorize URL ourselves
+    # would leave the redirect URI with nothing listening.
     auth_manager = SpotifyOAuth(
         client_id=client_id,
         client_secret=client_secret,
         redirect_uri=redirect_uri,
         scope=SCOPES,
-        # Default cache path is .cache-<username>, which is fine for most cases.
-        # cache_path="path/to/your/cache/file" # Optional: specify a custom cache path
+        cache_handler=memory_handler,
     )
 
+    # validate_token also refreshes an expired token if a refresh token is
+    # available. When that yields a usable token, no interactive flow can
+    # be needed, so the browser spawn is disabled outright.
+    if auth_manager.validate_token(memory_handler.get_cached_token()) is not None:
+        auth_manager.open_browser = False
+
     # The spotipy.Spotify client uses the auth_manager to handle authentication.
-    spotify_client = spotipy.Spotify(auth_manager=auth_manager)
+    # The shared session keeps TLS connections to the API host alive across
+    # the whole paginated fetch instead of reconnecting per request.
+    spotify_client = spotipy.Spotify(
+        auth_manager=auth_manager,
+        requests_session=get_shared_session(),
+    )
 
+    _client_cache[key] = spotify_client
     return spotify_client
+
+
+def save_spotify_token_cache():
+    """
+    Writes the in-memory token cache back to the on-disk cache file so the
+    next application run can reuse it. Safe to call when no client has been
+    created yet (it simply does nothing).
+    """
+    if _active_cache_handlers is None:
+        return
+    memory_handler, disk_handler = _active_cache_handlers
+    token_info = memory_handler.get_cached_token()
+    if token_info:
+        disk_handler.save_token_to_cache(token_info)
+
+
+def invalidate_spotify_client():
+    """
+    Drops any cached Spotify client so the next get_spotify_client() call
+    performs a fresh authentication. Intended for logout or credential changes.
+    """
+    global _active_cache_handlers
+    _client_cache.clear()
+    _active_cache_handlers = None
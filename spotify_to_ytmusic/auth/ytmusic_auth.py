@@ -1,10 +1,17 @@
 import os
 from ytmusicapi import YTMusic, setup_oauth
 
+from .http_session import get_shared_session
+
 # Define the path for the OAuth credentials file.
 # This file will store the authentication tokens after successful authorization.
 YT_OAUTH_FILE = 'oauth.json'
 
+# Cached client instance. Instantiating YTMusic re-reads and re-parses the
+# OAuth file, and callers tend to stat the file first; once a client has been
+# built successfully we can skip both on subsequent calls.
+_yt_client_singleton = None
+
 def setup_ytmusic_oauth():
     """
     Initiates the YouTube Music OAuth setup process.
@@ -53,6 +60,13 @@ def get_ytmusic_client():
     Returns:
         ytmusicapi.YTMusic: An authenticated YTMusic client instance.
     """
+    global _yt_client_singleton
+
+    # Fast path: reuse the already-authenticated client without touching
+    # the filesystem at all.
+    if _yt_client_singleton is not None:
+        return _yt_client_singleton
+
     if not os.path.exists(YT_OAUTH_FILE):
         raise FileNotFoundError(
             f"YouTube Music OAuth credentials file '{YT_OAUTH_FILE}' not found. "
@@ -61,5 +75,17 @@ def get_ytmusic_client():
         )
 
     # Initialize the YTMusic client using the saved OAuth credentials.
-    ytmusic_client = YTMusic(YT_OAUTH_FILE)
+    # The shared session reuses pooled TLS connections for every search and
+    # playlist mutation during the transfer.
+    ytmusic_client = YTMusic(YT_OAUTH_FILE, requests_session=get_shared_session())
+    _yt_client_singleton = ytmusic_client
     return ytmusic_client
+
+
+def invalidate_ytmusic_client():
+    """
+    Drops the cached YTMusic client so the next get_ytmusic_client() call
+    re-reads the OAuth file. Intended for logout or credential changes.
+    """
+    global _yt_client_singleton
+    _yt_client_singleton = None
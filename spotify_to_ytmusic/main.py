@@ -1,54 +1,88 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import logging
-import threading
 import queue
 import os # Needed for checking YT OAuth file
+from concurrent.futures import ThreadPoolExecutor
 
-# Import project functions
-try:
-    from auth.spotify_auth import get_spotify_client
-    from auth.ytmusic_auth import setup_ytmusic_oauth, get_ytmusic_client, YT_OAUTH_FILE
-    from transfer.playlist_transfer import (
-        fetch_spotify_playlists,
-        save_playlists_to_json,
-        transfer_playlists_to_ytmusic,
-        SPOTIFY_DATA_FILE,
-    )
-except ImportError as e:
-    # Handle cases where the script might be run directly without the package structure
-    # This is a basic fallback, ideally run as a module
-    print(f"Error importing modules: {e}. Make sure you run this script from the project root "
-          f"or install the package.")
-    # Attempt relative imports if run as script within the directory (less ideal)
+# Project modules (auth.*, transfer.*) pull in spotipy, ytmusicapi and
+# requests, which together cost hundreds of milliseconds of import time.
+# They are imported lazily inside the button handlers below via
+# _import_project_module so the window appears immediately on launch.
+
+def _import_project_module(name):
+    """Imports a project submodule, handling both flat and package layouts.
+
+    Mirrors the old top-level try/except: prefer the flat import used when
+    running from the project root, fall back to the package-relative form.
+    """
+    import importlib
     try:
-        from .auth.spotify_auth import get_spotify_client
-        from .auth.ytmusic_auth import setup_ytmusic_oauth, get_ytmusic_client, YT_OAUTH_FILE
-        from .transfer.playlist_transfer import (
-            fetch_spotify_playlists,
-            save_playlists_to_json,
-            transfer_playlists_to_ytmusic,
-            SPOTIFY_DATA_FILE,
-        )
+        return importlib.import_module(name)
     except ImportError:
-        messagebox.showerror("Import Error", "Could not import required modules. Ensure the script is run correctly.")
-        exit()
+        try:
+            return importlib.import_module(f'.{name}', package=__package__)
+        except ImportError as e:
+            messagebox.showerror(
+                "Import Error",
+                f"Could not import required module '{name}'. "
+                f"Ensure the script is run correctly.\nError: {e}"
+            )
+            raise
 
 
 # --- Logging Setup ---
 
-# Queue for thread-safe logging updates to the GUI
-log_queue = queue.Queue()
+# Queue for thread-safe logging updates to the GUI. SimpleQueue is a leaner
+# C implementation than queue.Queue (no task tracking, single lock), which is
+# all this single-producer/single-consumer pipe needs.
+log_queue = queue.SimpleQueue()
+
+class MemoizedTimeFormatter(logging.Formatter):
+    """A Formatter that caches the formatted timestamp per whole second.
+
+    The default Formatter runs time.strftime for every record; during the
+    transfer loop hundreds of records can arrive within the same second, so
+    reusing the rendered time string drops that cost to once per second.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_second = None
+        self._last_asctime = None
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_asctime = super().formatTime(record, datefmt)
+        return self._last_asctime
+
 
 class TextHandler(logging.Handler):
-    """A logging handler that puts messages into a queue for the Tkinter UI."""
-    def __init__(self, queue):
+    """A logging handler that puts messages into a queue for the Tkinter UI.
+
+    After enqueueing, a virtual <<LogAdded>> event is generated on the root
+    window so the GUI drains the queue only when messages actually arrive,
+    instead of polling on a timer.
+    """
+    # The handler only ever carries these two attributes; __slots__ keeps
+    # instances from growing a per-instance __dict__ for them.
+    __slots__ = ('queue', 'root')
+
+    def __init__(self, queue, root):
         super().__init__()
         self.queue = queue
+        self.root = root
 
     def emit(self, record):
         log_entry = self.format(record)
         self.queue.put(log_entry)
+        try:
+            # event_generate with when='tail' is safe to call from worker
+            # threads; it appends the event to the Tk event queue.
+            self.root.event_generate('<<LogAdded>>', when='tail')
+        except tk.TclError:
+            pass  # Window is being destroyed; message stays in the queue.
 
 # --- Main Application Class ---
 
@@ -62,6 +96,20 @@ class PlaylistTransferApp:
         self.sp_client = None
         self.yt_client = None
 
+        # Shared worker pool for all background actions. Reusing a small pool
+        # avoids paying thread start-up cost on every button click and chained
+        # callback. Two workers are enough: one long-running action plus the
+        # occasional follow-up (e.g. YT setup -> client creation).
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+        # Coalesced UI-state updates (see _set_ui_state)
+        self._ui_busy = False
+        self._ui_state_pending = False
+
+        # Bind the logger once; logging.getLogger takes a module-wide lock
+        # on every lookup, and _log runs on the hot transfer path.
+        self._logger = logging.getLogger(__name__)
+
         # Main frame
         self.main_frame = ttk.Frame(root, padding="10")
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -97,58 +145,85 @@ class PlaylistTransferApp:
         self.log_area.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
         # --- Logging Configuration ---
-        self.log_handler = TextHandler(log_queue)
-        log_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self.log_handler = TextHandler(log_queue, self.root)
+        log_format = MemoizedTimeFormatter('%(asctime)s - %(levelname)s - %(message)s',
+                                           datefmt='%Y-%m-%d %H:%M:%S')
         self.log_handler.setFormatter(log_format)
 
-        # Configure root logger and project-specific loggers
+        # Configure the root logger only. The 'auth' and 'transfer' loggers
+        # propagate to root by default, so attaching the handler to them as
+        # well would format and enqueue every record twice.
         root_logger = logging.getLogger()
         root_logger.setLevel(logging.INFO) # Set overall level
         root_logger.addHandler(self.log_handler)
 
-        # Ensure project loggers also use this handler if they exist
-        logging.getLogger('auth').addHandler(self.log_handler)
-        logging.getLogger('transfer').addHandler(self.log_handler)
-        # Set levels for project loggers if needed (optional)
-        # logging.getLogger('auth').setLevel(logging.DEBUG)
-        # logging.getLogger('transfer').setLevel(logging.INFO)
 
+        # Persist the in-memory Spotify token cache back to disk on close
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
-        # Start processing the log queue
-        self._process_log_queue()
+        # Drain the log queue whenever the handler signals a new message.
+        # Event-driven draining avoids waking the event loop 10x/sec when idle.
+        self.root.bind('<<LogAdded>>', self._process_log_queue)
 
         self._log("Application started. Please follow the steps.")
 
+    def _on_close(self):
+        """Flushes cached credentials to disk and closes the window."""
+        try:
+            if self.sp_client is not None:
+                _import_project_module('auth.spotify_auth').save_spotify_token_cache()
+        except Exception as e:
+            logging.warning(f"Could not save Spotify token cache: {e}")
+        # Don't block the close on in-flight work; worker threads can't
+        # update the GUI once the window is gone anyway.
+        self._pool.shutdown(wait=False)
+        self.root.destroy()
+
     def _log(self, message, level=logging.INFO):
         """Logs a message using the logging framework."""
-        # Use the root logger or a specific logger
-        logger = logging.getLogger(__name__) # Or logging.getLogger()
-        logger.log(level, message)
+        self._logger.log(level, message)
+
 
+    # Trim the log widget back to LOG_KEEP_LINES once it exceeds
+    # LOG_TRIM_THRESHOLD lines. The hysteresis between the two values keeps
+    # the (comparatively expensive) delete from running on every insert.
+    LOG_KEEP_LINES = 2000
+    LOG_TRIM_THRESHOLD = 2500
 
     def _update_log_area(self, message):
         """Appends a message to the ScrolledText widget in a thread-safe way."""
-        self.log_area.configure(state=tk.NORMAL)
+        # Disable word-wrap for the duration of the bulk insert: with
+        # wrapping on, the Text widget re-lays-out the trailing viewport as
+        # the new lines land. Restoring it afterwards re-wraps just once.
+        self.log_area.configure(state=tk.NORMAL, wrap=tk.NONE)
         self.log_area.insert(tk.END, message + '\n')
-        self.log_area.configure(state=tk.DISABLED)
+        # Bound the widget's memory: a long transfer can log tens of
+        # thousands of lines, and Text insert cost grows with buffer size.
+        lines = int(self.log_area.index('end-1c').split('.')[0])
+        if lines > self.LOG_TRIM_THRESHOLD:
+            self.log_area.delete('1.0', f'{lines - self.LOG_KEEP_LINES}.0')
+        self.log_area.configure(state=tk.DISABLED, wrap=tk.WORD)
         self.log_area.see(tk.END) # Scroll to the end
 
-    def _process_log_queue(self):
-        """Processes messages from the log queue and updates the GUI."""
+    def _process_log_queue(self, event=None):
+        """Drains all pending messages from the log queue into the GUI.
+
+        Messages are accumulated and flushed with a single insert so a burst
+        of log lines costs one widget update instead of one per message.
+        """
+        messages = []
         try:
             while True:
-                message = log_queue.get_nowait()
-                self._update_log_area(message)
+                messages.append(log_queue.get_nowait())
         except queue.Empty:
-            pass # No messages in the queue
-        # Schedule the next check
-        self.root.after(100, self._process_log_queue)
+            pass # No more messages in the queue
+        if messages:
+            self._update_log_area('\n'.join(messages))
 
     def _run_in_thread(self, target_func, callback=None, args=()):
-        """Runs a target function in a separate thread."""
-        thread = threading.Thread(target=self._thread_wrapper, args=(target_func, callback, args), daemon=True)
-        thread.start()
-        return thread # Might be useful for tracking later
+        """Runs a target function on the shared worker pool."""
+        future = self._pool.submit(self._thread_wrapper, target_func, callback, args)
+        return future # Might be useful for tracking later
 
     def _thread_wrapper(self, target_func, callback, args):
         """Wrapper to execute the target function and handle result/error."""
@@ -165,65 +240,91 @@ class PlaylistTransferApp:
                 # Schedule callback in the main thread with error info
                 self.root.after(0, callback, False, e) # Success = False
 
+    # --- UI State Management ---
+
+    def _set_ui_state(self, busy=False):
+        """Requests a refresh of the three action buttons' enabled states.
+
+        The actual widget reconfiguration is deferred to an idle callback so
+        that several state changes issued in quick succession (e.g. within a
+        callback chain) collapse into a single pass over the widgets.
+        """
+        self._ui_busy = busy
+        if not self._ui_state_pending:
+            self._ui_state_pending = True
+            self.root.after_idle(self._apply_ui_state)
+
+    def _apply_ui_state(self):
+        """Applies the current login/busy state to all buttons in one batch."""
+        self._ui_state_pending = False
+        busy = self._ui_busy
+        # Each step is only available once the previous one has completed,
+        # and nothing is clickable while a background action is running.
+        self.spotify_button.config(
+            state=tk.DISABLED if busy else tk.NORMAL)
+        self.ytmusic_button.config(
+            state=tk.NORMAL if (not busy and self.sp_client) else tk.DISABLED)
+        self.transfer_button.config(
+            state=tk.NORMAL if (not busy and self.sp_client and self.yt_client) else tk.DISABLED)
+
     # --- Button Actions ---
 
     def _spotify_login(self):
         self._log("Attempting Spotify login...")
-        self.spotify_button.config(state=tk.DISABLED) # Disable while logging in
-        self._run_in_thread(get_spotify_client, self._spotify_login_callback)
+        self._set_ui_state(busy=True) # Disable while logging in
+        spotify_auth = _import_project_module('auth.spotify_auth')
+        self._run_in_thread(spotify_auth.get_spotify_client, self._spotify_login_callback)
 
     def _spotify_login_callback(self, success, result):
-        self.spotify_button.config(state=tk.NORMAL) # Re-enable button
         if success:
             self.sp_client = result
             self._log("Spotify login successful!")
-            self.ytmusic_button.config(state=tk.NORMAL) # Enable next step
-            # Maybe disable Spotify button after success? Optional.
-            # self.spotify_button.config(state=tk.DISABLED)
         else:
             self._log(f"Spotify login failed: {result}", level=logging.ERROR)
             messagebox.showerror("Spotify Login Error", f"Could not log in to Spotify.\nError: {result}\n\nPlease ensure environment variables are set correctly and try again.")
             self.sp_client = None
-            self.ytmusic_button.config(state=tk.DISABLED)
-            self.transfer_button.config(state=tk.DISABLED)
+        self._set_ui_state(busy=False)
 
     def _ytmusic_login(self):
         self._log("Attempting YouTube Music login/setup...")
-        self.ytmusic_button.config(state=tk.DISABLED) # Disable while processing
+        self._set_ui_state(busy=True) # Disable while processing
+
+        ytmusic_auth = _import_project_module('auth.ytmusic_auth')
+
+        # Already logged in: skip the filesystem check entirely and just
+        # refresh our reference via the cached client.
+        if self.yt_client is not None:
+            self._run_in_thread(ytmusic_auth.get_ytmusic_client, self._ytmusic_login_callback)
+            return
 
         # Check if setup file exists
-        if not os.path.exists(YT_OAUTH_FILE):
-            self._log(f"'{YT_OAUTH_FILE}' not found. Starting first-time setup.")
+        if not os.path.exists(ytmusic_auth.YT_OAUTH_FILE):
+            self._log(f"'{ytmusic_auth.YT_OAUTH_FILE}' not found. Starting first-time setup.")
             self._log("Please follow the instructions printed in the CONSOLE/TERMINAL "
                       "where you ran this application to authorize access.", level=logging.WARNING)
             # Run setup in thread because it blocks waiting for console input
-            self._run_in_thread(setup_ytmusic_oauth, self._ytmusic_setup_callback)
+            self._run_in_thread(ytmusic_auth.setup_ytmusic_oauth, self._ytmusic_setup_callback)
         else:
-            self._log(f"Found '{YT_OAUTH_FILE}'. Attempting to get client.")
+            self._log(f"Found '{ytmusic_auth.YT_OAUTH_FILE}'. Attempting to get client.")
             # File exists, try getting the client directly
-            self._run_in_thread(get_ytmusic_client, self._ytmusic_login_callback)
+            self._run_in_thread(ytmusic_auth.get_ytmusic_client, self._ytmusic_login_callback)
 
     def _ytmusic_setup_callback(self, success, result):
         if success:
             self._log("YouTube Music setup process completed.")
             # Now try to get the client again
-            self._run_in_thread(get_ytmusic_client, self._ytmusic_login_callback)
+            ytmusic_auth = _import_project_module('auth.ytmusic_auth')
+            self._run_in_thread(ytmusic_auth.get_ytmusic_client, self._ytmusic_login_callback)
         else:
             self._log(f"YouTube Music setup failed: {result}", level=logging.ERROR)
             messagebox.showerror("YouTube Music Setup Error", f"Setup failed.\nError: {result}\nPlease check the console output and try again.")
-            self.ytmusic_button.config(state=tk.NORMAL) # Re-enable to allow retry
             self.yt_client = None
-            self.transfer_button.config(state=tk.DISABLED)
+            self._set_ui_state(busy=False) # Re-enable to allow retry
 
     def _ytmusic_login_callback(self, success, result):
-        self.ytmusic_button.config(state=tk.NORMAL) # Re-enable button
         if success:
             self.yt_client = result
             self._log("YouTube Music login successful!")
-            if self.sp_client: # Only enable transfer if Spotify is also ready
-                self.transfer_button.config(state=tk.NORMAL)
-            # Maybe disable YT button after success? Optional.
-            # self.ytmusic_button.config(state=tk.DISABLED)
         else:
             self._log(f"YouTube Music login failed: {result}", level=logging.ERROR)
             # Specific check for FileNotFoundError after setup attempt
@@ -232,7 +333,7 @@ class PlaylistTransferApp:
             else:
                  messagebox.showerror("YouTube Music Login Error", f"Could not log in to YouTube Music.\nError: {result}")
             self.yt_client = None
-            self.transfer_button.config(state=tk.DISABLED)
+        self._set_ui_state(busy=False)
 
 
     def _start_transfer(self):
@@ -244,32 +345,61 @@ class PlaylistTransferApp:
             return
 
         self._log("Starting playlist transfer process...")
-        self.transfer_button.config(state=tk.DISABLED) # Disable during transfer
-        # Disable other buttons too?
-        self.spotify_button.config(state=tk.DISABLED)
-        self.ytmusic_button.config(state=tk.DISABLED)
+        self._set_ui_state(busy=True) # Disable all buttons during transfer
 
         # Run the whole transfer sequence in a thread
         self._run_in_thread(self._transfer_sequence, self._transfer_callback)
 
+    def _ensure_fresh_token(self):
+        """
+        Forces a refresh of the Spotify access token if it is expired or close
+        to expiring. Long transfers can cross the 1-hour token boundary, and a
+        mid-loop 401 would throw away partial progress; refreshing up front
+        means each phase starts with a full-lifetime token.
+        """
+        if not self.sp_client:
+            return
+        auth_manager = getattr(self.sp_client, 'auth_manager', None)
+        if auth_manager is None:
+            return
+        try:
+            token_info = auth_manager.cache_handler.get_cached_token()
+            if token_info and auth_manager.is_token_expired(token_info):
+                self._log("Spotify token expired. Refreshing before continuing...")
+                auth_manager.refresh_access_token(token_info['refresh_token'])
+            else:
+                # validate_token also refreshes when within the expiry margin.
+                auth_manager.validate_token(token_info)
+        except Exception as e:
+            # A failed proactive refresh is not fatal; spotipy will retry on
+            # the next API call and surface a proper error if it truly fails.
+            self._log(f"Proactive token refresh failed: {e}", level=logging.WARNING)
+
     def _transfer_sequence(self):
         """The actual sequence of fetching, saving, and transferring."""
+        transfer = _import_project_module('transfer.playlist_transfer')
+
+        # Start with a full-lifetime token so the fetch phase cannot expire mid-loop.
+        self._ensure_fresh_token()
+
         # 1. Fetch from Spotify
         self._log("Step 1/3: Fetching playlists from Spotify...")
-        spotify_playlists = fetch_spotify_playlists(self.sp_client)
+        spotify_playlists = transfer.fetch_spotify_playlists(self.sp_client)
         if not spotify_playlists:
             # fetch_spotify_playlists logs errors internally
             raise RuntimeError("Failed to fetch any playlists from Spotify. Check logs.")
         self._log(f"Fetched {len(spotify_playlists)} playlists from Spotify.")
 
         # 2. Save to JSON (optional but good practice)
-        self._log(f"Step 2/3: Saving Spotify data to '{SPOTIFY_DATA_FILE}'...")
-        save_playlists_to_json(spotify_playlists, SPOTIFY_DATA_FILE)
+        self._log(f"Step 2/3: Saving Spotify data to '{transfer.SPOTIFY_DATA_FILE}'...")
+        transfer.save_playlists_to_json(spotify_playlists, transfer.SPOTIFY_DATA_FILE)
         self._log("Spotify data saved.")
 
         # 3. Transfer to YouTube Music
+        # Refresh again: the transfer itself can run for more than an hour.
+        self._ensure_fresh_token()
         self._log("Step 3/3: Transferring playlists to YouTube Music...")
-        transfer_success = transfer_playlists_to_ytmusic(self.yt_client, SPOTIFY_DATA_FILE)
+        transfer_success = transfer.transfer_playlists_to_ytmusic(self.yt_client, transfer.SPOTIFY_DATA_FILE)
         if not transfer_success:
             # transfer_playlists_to_ytmusic logs errors internally
              raise RuntimeError("Playlist transfer process reported an issue. Check logs.")
@@ -280,9 +410,7 @@ class PlaylistTransferApp:
 
     def _transfer_callback(self, success, result):
         # Re-enable buttons regardless of outcome
-        self.transfer_button.config(state=tk.NORMAL)
-        self.spotify_button.config(state=tk.NORMAL) # Or keep disabled if successful login?
-        self.ytmusic_button.config(state=tk.NORMAL) # Or keep disabled if successful login?
+        self._set_ui_state(busy=False)
 
         if success:
             self._log(f"Transfer Sequence Result: {result}", level=logging.INFO)
@@ -2,132 +2,595 @@ import spotipy
 import logging
 import json
 import os
+import re
+import sqlite3
+import threading
 import time
+import unicodedata
 import ytmusicapi
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+# orjson serializes/parses several times faster than the pure-Python json
+# module; fall back to stdlib json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson parses JSON incrementally, letting the transfer iterate playlists
+# without ever holding the whole dump in memory; optional like orjson.
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Module logger for the hot per-track paths. %-style arguments are only
+# interpolated when the record actually passes the level filter, unlike the
+# f-strings used in the coarser per-playlist logs, which run regardless.
+logger = logging.getLogger(__name__)
+
 # Define the default filename for storing fetched Spotify playlist data
 SPOTIFY_DATA_FILE = 'spotify_playlists.json'
 
-def fetch_spotify_playlists(sp: spotipy.Spotify):
+# JSON-Lines variant of the playlist dump: one playlist object per line,
+# appended as soon as its tracks are fetched (see
+# fetch_spotify_playlists_streaming).
+SPOTIFY_DATA_JSONL_FILE = 'spotify_playlists.jsonl'
+
+# IDs of Spotify playlists that have already been transferred, one per line.
+# Lets an interrupted transfer resume without redoing finished playlists.
+TRANSFERRED_IDS_FILE = 'transferred_ids.txt'
+
+# Number of concurrent YouTube Music search requests. The searches are pure
+# network I/O, so a handful of workers collapses wall time without saturating
+# the API (actual request rate is governed by the limiter below).
+YT_SEARCH_WORKERS = 8
+
+# Number of playlists whose tracks are fetched from Spotify concurrently.
+SPOTIFY_FETCH_WORKERS = 5
+
+# Number of track pages fetched concurrently within a single playlist.
+SPOTIFY_PAGE_WORKERS = 5
+
+# YT Music sometimes times out or silently drops items on very large
+# add_playlist_items calls, so adds are split into chunks of this size and
+# submitted concurrently on a small pool.
+YT_ADD_CHUNK_SIZE = 100
+YT_ADD_WORKERS = 4
+
+
+class _RateLimiter:
+    """A simple thread-safe token-bucket limiter for outgoing API calls.
+
+    Workers call acquire() before each request; calls are spaced so that no
+    more than max_per_second requests are issued across all threads.
     """
-    Fetches all current user's playlists and their tracks from Spotify.
 
-    Handles pagination for both playlists and tracks within each playlist.
-    Extracts playlist name, track name, first artist name, and album name.
+    def __init__(self, max_per_second: float):
+        self._interval = 1.0 / max_per_second
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(self._next_slot, now) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Global limiter shared by all search workers: ~5 requests/second keeps us
+# comfortably below YT Music's throttling threshold while still being far
+# faster than the old fixed 0.6s sleep per track.
+_yt_search_limiter = _RateLimiter(max_per_second=5.0)
+
+# Limiter for Spotify requests: with playlist- and page-level fan-out both
+# active, this caps the combined request rate below Spotify's per-app limit.
+_spotify_limiter = _RateLimiter(max_per_second=10.0)
+
+# Persistent track -> videoId search cache. Playlists routinely share tracks
+# (remixes, "best of" lists), and the YT Music search is the single most
+# expensive call in the transfer, so known results are reused across
+# playlists and across runs.
+YT_SEARCH_CACHE_FILE = 'yt_search_cache.sqlite'
+
+# How long a "no match found" entry stays valid before the track is searched
+# again. New uploads appear on YT Music all the time, so negatives expire;
+# positive matches are kept indefinitely.
+YT_SEARCH_NEGATIVE_TTL = 7 * 24 * 60 * 60  # 7 days, in seconds
+
+
+def _norm_str(s: str) -> str:
+    """Normalizes one name component for cache-key purposes."""
+    return unicodedata.normalize('NFKD', s).lower().strip()
+
+
+@lru_cache(maxsize=8192)
+def _normalize_cache_key(track_name: str, artist_name: str) -> str:
+    """Builds a normalized cache key from a track and artist name.
+
+    Memoized: the same tracks recur across playlists ("liked songs" vs.
+    themed lists), so each distinct pair pays the Unicode normalization
+    once per process instead of once per occurrence.
+    """
+    return f"{_norm_str(track_name)}\x1f{_norm_str(artist_name)}"
+
+
+class _YTSearchCache:
+    """SQLite-backed cache of YouTube Music search results.
+
+    Stores videoIds keyed by normalized (track, artist); an empty string
+    records a search that found no match, so misses are not retried on
+    every run (until the negative TTL expires). All access is expected to
+    happen on the coordinating thread, not the search workers.
+    """
+
+    COMMIT_EVERY = 32  # Batch commits to avoid an fsync per write
+
+    def __init__(self, path: str = YT_SEARCH_CACHE_FILE):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS yt_search_cache ("
+            "key TEXT PRIMARY KEY, video_id TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._pending_writes = 0
+
+    def get(self, key: str):
+        """Returns the cached videoId ('' for a known miss), or None if absent."""
+        row = self._conn.execute(
+            "SELECT video_id, updated FROM yt_search_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        video_id, updated = row
+        # Stale negatives are treated as absent so the track is re-searched.
+        if video_id == '' and time.time() - updated > YT_SEARCH_NEGATIVE_TTL:
+            return None
+        return video_id
+
+    def put(self, key: str, video_id: str):
+        """Stores a search result; pass '' to record that nothing was found."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO yt_search_cache (key, video_id, updated) "
+            "VALUES (?, ?, ?)", (key, video_id, time.time())
+        )
+        self._pending_writes += 1
+        if self._pending_writes >= self.COMMIT_EVERY:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+# Matches the status code ytmusicapi embeds in its error messages, e.g.
+# "Server returned HTTP 429: Too Many Requests."
+_HTTP_STATUS_IN_MESSAGE = re.compile(r'HTTP (\d{3})')
+
+
+def _extract_http_status(e: Exception):
+    """
+    Best-effort extraction of the HTTP status code behind an API client
+    exception, or None if there isn't one.
+
+    requests exceptions carry a .response; spotipy attaches .http_status;
+    ytmusicapi raises plain exceptions built from the response text, so for
+    those the code is parsed out of the message.
+    """
+    status = getattr(getattr(e, 'response', None), 'status_code', None)
+    if status is not None:
+        return status
+    status = getattr(e, 'http_status', None)
+    if status is not None:
+        return status
+    match = _HTTP_STATUS_IN_MESSAGE.search(str(e))
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def _retry_after_seconds(e: Exception):
+    """
+    Returns the Retry-After delay (in seconds) from the HTTP response behind
+    an exception, or None when no response or parseable header is attached.
+    Handles both the delta-seconds and HTTP-date forms of the header.
+    """
+    response = getattr(e, 'response', None)
+    if response is None:
+        return None
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is None:
+        return None
+    try:
+        return max(0, int(retry_after))
+    except ValueError:
+        pass
+    try:
+        target = parsedate_to_datetime(retry_after)
+        return max(0, (target - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _call_with_backoff(fn, *args, **kwargs):
+    """
+    Calls an API function, retrying with exponential backoff when the
+    server answers with HTTP 429. The Retry-After header is honored when
+    a response (and a parseable header) is attached to the exception;
+    other errors propagate to the caller unchanged.
+
+    This is the only throttling protection for the POST-based ytmusicapi
+    calls: the shared session's transport-level Retry does not retry POSTs
+    (urllib3's default allowed_methods excludes them), and ytmusicapi
+    wraps HTTP errors in its own exception types, so the status has to be
+    recovered via _extract_http_status rather than a .response attribute.
+    """
+    max_attempts = 5
+    for attempt in range(max_attempts):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if _extract_http_status(e) != 429 or attempt == max_attempts - 1:
+                raise
+            delay = _retry_after_seconds(e)
+            if delay is None:
+                delay = 2 ** attempt
+            logging.warning(f"Rate limited by YouTube Music (429). "
+                            f"Backing off for {delay}s (attempt {attempt + 1}/{max_attempts}).")
+            time.sleep(delay)
+
+
+# Sentinel returned by _search_track_on_ytmusic when the search itself
+# failed (network error, throttling, auth problem). Distinct from None,
+# which means the search completed but found no match: only genuine
+# no-match results may be written to the persistent cache as negatives.
+_SEARCH_FAILED = object()
+
+
+def _search_track_on_ytmusic(yt: ytmusicapi.YTMusic, query: str):
+    """
+    Searches YouTube Music for a single track query and returns the best
+    matching videoId, None if the search completed but found nothing
+    suitable, or _SEARCH_FAILED if the search could not be performed.
+
+    A single unfiltered search returns both songs and videos; song results
+    are preferred, with videos as the fallback. This halves the request
+    count on the miss path compared to issuing separate filtered searches.
+    """
+    try:
+        _yt_search_limiter.acquire()
+        search_results = _call_with_backoff(yt.search, query, limit=5) or [] # Limit results
+
+        # Prefer a song match; check the first few results for a likely one.
+        for result in search_results:
+            if result.get('videoId') and result.get('resultType') == 'song':
+                logger.info("  Found song match for '%s': Video ID %s", query, result['videoId'])
+                return result['videoId']
+
+        # Fallback: take the first video result from the same response.
+        # This logic can be refined based on title matching etc.
+        for result in search_results:
+            if result.get('videoId') and result.get('resultType') == 'video':
+                logger.info("  Found video match for '%s': Video ID %s", query, result['videoId'])
+                return result['videoId']
+
+        logger.warning("  Could not find any match for track: '%s' on YouTube Music.", query)
+        return None
+
+    except Exception as e:
+        logger.error("Error searching for track '%s': %s", query, e)
+        return _SEARCH_FAILED # Continue with the other tracks even if one search fails
+
+
+def _add_playlist_chunk(yt: ytmusicapi.YTMusic, playlist_name: str,
+                        yt_playlist_id: str, chunk: list) -> bool:
+    """
+    Adds one chunk of video IDs to a YouTube Music playlist, logging the
+    outcome. Errors are logged rather than raised so one failed chunk does
+    not abort the rest of the transfer.
+
+    Returns:
+        True if the add call succeeded, False otherwise. The caller uses
+        this to decide whether the playlist may be marked as transferred.
+    """
+    try:
+        status = _call_with_backoff(yt.add_playlist_items, yt_playlist_id, chunk)
+        logging.info(f"API response for adding {len(chunk)} tracks to '{playlist_name}': {status}")
+        if isinstance(status, dict) and 'status' in status and status['status'] == 'STATUS_SUCCEEDED':
+            logging.info(f"Successfully added {len(chunk)} tracks to playlist '{playlist_name}'.")
+        else:
+            logging.warning(f"Potential issue adding tracks to '{playlist_name}'. Response: {status}")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to add tracks to YT Music playlist '{playlist_name}' (ID: {yt_playlist_id}). Error: {e}")
+        return False
+
+def _get_existing_yt_playlists(yt: ytmusicapi.YTMusic) -> dict:
+    """
+    Returns {title: playlistId} for the playlists already in the user's
+    YouTube Music library.
+
+    Fetched once per transfer so re-runs reuse existing playlists instead
+    of attempting (and failing, with backoff) a create call per playlist.
+    On error an empty mapping is returned and the transfer falls back to
+    creating playlists unconditionally.
+    """
+    try:
+        library = _call_with_backoff(yt.get_library_playlists, limit=None) or []
+        return {p['title']: p['playlistId'] for p in library
+                if p.get('title') and p.get('playlistId')}
+    except Exception as e:
+        logging.error(f"Could not fetch existing YouTube Music playlists: {e}")
+        return {}
+
+
+def _get_playlist_video_ids(yt: ytmusicapi.YTMusic, yt_playlist_id: str) -> set:
+    """
+    Returns the set of videoIds currently in a YouTube Music playlist.
+
+    Used when reusing an existing playlist so tracks it already contains
+    are not added a second time. On error returns an empty set; the worst
+    case is a duplicate add, which YT Music itself deduplicates.
+    """
+    try:
+        playlist = _call_with_backoff(yt.get_playlist, yt_playlist_id, limit=None) or {}
+        return {t['videoId'] for t in playlist.get('tracks', []) if t.get('videoId')}
+    except Exception as e:
+        logging.warning(f"Could not fetch current tracks of YT playlist "
+                        f"{yt_playlist_id}; existing tracks may be re-added. Error: {e}")
+        return set()
+
+
+def _get_playlists_page(sp: spotipy.Spotify, limit: int, offset: int):
+    """
+    Fetches one page of the current user's playlists, trimmed to the fields
+    we actually use.
+
+    spotipy's current_user_playlists() does not expose the 'fields'
+    parameter, so this goes through the underlying _get. Without the filter
+    Spotify returns the full playlist objects (images, owner, snapshot_id,
+    ...), which is 10-50x more payload than the name/id pairs needed here.
+    The top-level 'next' stays in the pager, so pagination is unaffected.
+    tracks.total is included so the track pages can be fetched in parallel.
+    """
+    return sp._get('me/playlists', limit=limit, offset=offset,
+                   fields='items(name,id,tracks.total),next')
+
+
+def _fetch_tracks_page(sp: spotipy.Spotify, playlist_name: str, playlist_id: str,
+                       offset: int, limit: int = 100):
+    """
+    Fetches a single page of a playlist's tracks.
+
+    Returns the raw API page dict, or None if the request failed.
+    """
+    # Request only necessary fields to optimize the API call
+    logging.debug(f"Fetching tracks batch for '{playlist_name}': offset={offset}, limit={limit}")
+    try:
+        _spotify_limiter.acquire()
+        return sp.playlist_items(
+            playlist_id,
+            limit=limit,
+            offset=offset,
+            fields='items(track(name, id, artists(name), album(name))),next', # Added 'next' to fields
+            additional_types=['track']
+        )
+    except spotipy.exceptions.SpotifyException as e:
+        logging.error(f"Error fetching tracks for playlist '{playlist_name}' (ID: {playlist_id}): {e}")
+        return None
+
+
+def _extract_tracks(items: list, playlist_name: str, names: list, artists: list, albums: list):
+    """Parses API track items, appending into three parallel field lists.
+
+    Tracks are stored structure-of-arrays style ({'names': [...],
+    'artists': [...], 'albums': [...]}) rather than as one dict per track:
+    three flat string lists carry no per-track dict overhead and serialize
+    considerably faster.
+
+    This is the hottest per-track loop in the fetch path, so field access
+    uses direct subscripts with try/except instead of chained .get() calls:
+    the well-formed case (virtually every track) pays no temporary-dict
+    allocations, and the rare malformed item falls through to the default.
+    """
+    # Avoid attribute lookups per track; the debug check is hoisted so the
+    # common (filtered-out) case skips even the logger dispatch per track.
+    names_append = names.append
+    artists_append = artists.append
+    albums_append = albums.append
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    for item in items:
+        track_info = item.get('track')
+
+        # Skip if item is not a track or track info is missing
+        if not track_info:
+            logger.warning("Skipping item in '%s' - missing track data.", playlist_name)
+            continue
+
+        try:
+            track_name = track_info['name']
+        except (KeyError, TypeError):
+            track_name = 'Unknown Track'
+        try:
+            album_name = track_info['album']['name']
+        except (KeyError, TypeError):
+            album_name = 'Unknown Album'
+        try:
+            artist_name = track_info['artists'][0]['name']
+        except (KeyError, IndexError, TypeError):
+            artist_name = 'Unknown Artist'
+
+        names_append(track_name)
+        artists_append(artist_name)
+        albums_append(album_name)
+        if debug_enabled:
+            logger.debug("  Added track: %s - %s - %s", track_name, artist_name, album_name)
+
+
+def _fetch_playlist_tracks(sp: spotipy.Spotify, playlist_name: str, playlist_id: str,
+                           total: int = None):
+    """
+    Fetches all tracks for a single Spotify playlist.
+
+    When the playlist's total track count is known (from the playlist index),
+    all page offsets are computed up front and fetched concurrently, so a
+    1000-track playlist costs one round-trip of wall time instead of ten.
+    Without a total it falls back to sequential 'next'-cursor pagination.
 
     Args:
         sp: An authenticated spotipy.Spotify client instance.
+        playlist_name: The playlist's display name (used for logging only).
+        playlist_id: The Spotify playlist ID to fetch tracks for.
+        total: The playlist's track count, if known.
 
     Returns:
-        list: A list of dictionaries, where each dictionary represents a playlist
-              and contains 'name' (playlist name) and 'tracks' (a list of track
-              dictionaries with 'name', 'artist', and 'album').
-              Returns an empty list if no playlists are found or in case of an error.
+        dict: Parallel track field lists {'names': [...], 'artists': [...],
+              'albums': [...]}. The lists are empty if an API error occurs
+              mid-fetch.
     """
-    all_playlists_data = []
+    logging.info(f"Fetching tracks for playlist: '{playlist_name}' (ID: {playlist_id})")
+    tracks_limit = 100 # Max limit for tracks is 100
+    names, artists, albums = [], [], []
+    tracks_data = {'names': names, 'artists': artists, 'albums': albums}
+    empty = {'names': [], 'artists': [], 'albums': []}
+
+    if total is not None:
+        offsets = range(0, total, tracks_limit)
+        if not offsets:
+            return empty
+        with ThreadPoolExecutor(max_workers=SPOTIFY_PAGE_WORKERS) as ex:
+            pages = list(ex.map(
+                lambda o: _fetch_tracks_page(sp, playlist_name, playlist_id, o, tracks_limit),
+                offsets
+            ))
+        if any(page is None for page in pages):
+            # Keep the established behaviour: a failed page drops the whole
+            # playlist rather than transferring it partially.
+            return empty
+        for page in pages:
+            _extract_tracks(page.get('items') or [], playlist_name, names, artists, albums)
+        return tracks_data
+
+    # Fallback: total unknown, page through sequentially via the cursor.
+    tracks_offset = 0
+    while True:
+        tracks_batch = _fetch_tracks_page(sp, playlist_name, playlist_id, tracks_offset, tracks_limit)
+        if tracks_batch is None:
+            # Decide whether to skip the playlist or stop entirely
+            # For now, we'll skip this playlist and continue with others
+            return empty # Drop potentially partial data
+
+        if not tracks_batch.get('items'):
+            logging.debug(f"No more tracks found for playlist '{playlist_name}'.")
+            break # Exit if no track items are returned in the batch
+
+        _extract_tracks(tracks_batch['items'], playlist_name, names, artists, albums)
+
+        # Check if there are more tracks to fetch for the current playlist
+        if tracks_batch.get('next') is None:
+            logging.debug(f"No more pages of tracks for playlist '{playlist_name}'.")
+            break  # Exit the loop if no more pages
+        else:
+            tracks_offset += tracks_limit # Increment offset for the next batch of tracks
+
+    return tracks_data
+
+
+def _fetch_playlist_metas(sp: spotipy.Spotify):
+    """
+    Pages through the current user's playlist index and collects
+    (name, id, track_total) tuples in library order.
+    """
+    playlist_metas = []
     playlists_offset = 0
     playlists_limit = 50  # Max limit for playlists is 50
 
-    logging.info("Starting to fetch Spotify playlists...")
+    while True:
+        # Fetch a batch of playlists
+        logging.info(f"Fetching playlists batch: offset={playlists_offset}, limit={playlists_limit}")
+        playlists_batch = _get_playlists_page(sp, playlists_limit, playlists_offset)
 
-    try:
-        while True:
-            # Fetch a batch of playlists
-            logging.info(f"Fetching playlists batch: offset={playlists_offset}, limit={playlists_limit}")
-            playlists_batch = sp.current_user_playlists(limit=playlists_limit, offset=playlists_offset)
+        if not playlists_batch or not playlists_batch.get('items'):
+            logging.warning("No playlists found or empty batch received.")
+            break  # Exit if no items are returned
 
-            if not playlists_batch or not playlists_batch.get('items'):
-                logging.warning("No playlists found or empty batch received.")
-                break  # Exit if no items are returned
+        for playlist in playlists_batch['items']:
+            playlist_name = playlist.get('name', 'Unknown Playlist')
+            playlist_id = playlist.get('id')
+            track_total = playlist.get('tracks', {}).get('total')
 
-            for playlist in playlists_batch['items']:
-                playlist_name = playlist.get('name', 'Unknown Playlist')
-                playlist_id = playlist.get('id')
+            if not playlist_id:
+                logging.warning(f"Skipping playlist '{playlist_name}' due to missing ID.")
+                continue
 
-                if not playlist_id:
-                    logging.warning(f"Skipping playlist '{playlist_name}' due to missing ID.")
-                    continue
+            playlist_metas.append((playlist_name, playlist_id, track_total))
 
-                logging.info(f"Fetching tracks for playlist: '{playlist_name}' (ID: {playlist_id})")
-                tracks_data = []
-                tracks_offset = 0
-                tracks_limit = 100 # Max limit for tracks is 100
-
-                while True:
-                    # Fetch a batch of tracks for the current playlist
-                    # Request only necessary fields to optimize the API call
-                    logging.debug(f"Fetching tracks batch for '{playlist_name}': offset={tracks_offset}, limit={tracks_limit}")
-                    try:
-                        tracks_batch = sp.playlist_items(
-                            playlist_id,
-                            limit=tracks_limit,
-                            offset=tracks_offset,
-                            fields='items(track(name, id, artists(name), album(name))),next', # Added 'next' to fields
-                            additional_types=['track']
-                        )
-                    except spotipy.exceptions.SpotifyException as e:
-                         logging.error(f"Error fetching tracks for playlist '{playlist_name}' (ID: {playlist_id}): {e}")
-                         # Decide whether to skip the playlist or stop entirely
-                         # For now, we'll skip this playlist and continue with others
-                         tracks_data = [] # Clear potentially partial data
-                         break # Break inner loop for this playlist
-
-
-                    if not tracks_batch or not tracks_batch.get('items'):
-                        logging.debug(f"No more tracks found for playlist '{playlist_name}'.")
-                        break # Exit if no track items are returned in the batch
-
-                    for item in tracks_batch['items']:
-                        track_info = item.get('track')
-
-                        # Skip if item is not a track or track info is missing
-                        if not track_info:
-                            logging.warning(f"Skipping item in '{playlist_name}' - missing track data.")
-                            continue
+        # Check if there are more playlists to fetch
+        if playlists_batch.get('next') is None:
+            logging.info("No more pages of playlists.")
+            break # Exit the loop if no more pages
+        else:
+            playlists_offset += playlists_limit # Increment offset for the next batch of playlists
 
-                        track_name = track_info.get('name', 'Unknown Track')
-                        album_name = track_info.get('album', {}).get('name', 'Unknown Album')
+    return playlist_metas
 
-                        # Get the first artist's name, handle missing artists list
-                        artists = track_info.get('artists')
-                        artist_name = artists[0].get('name', 'Unknown Artist') if artists else 'Unknown Artist'
 
-                        tracks_data.append({
-                            'name': track_name,
-                            'artist': artist_name,
-                            'album': album_name
-                        })
-                        logging.debug(f"  Added track: {track_name} - {artist_name} - {album_name}")
+def fetch_spotify_playlists(sp: spotipy.Spotify):
+    """
+    Fetches all current user's playlists and their tracks from Spotify.
 
-                    # Check if there are more tracks to fetch for the current playlist
-                    if tracks_batch.get('next') is None:
-                        logging.debug(f"No more pages of tracks for playlist '{playlist_name}'.")
-                        break  # Exit the inner loop if no more pages
-                    else:
-                        tracks_offset += tracks_limit # Increment offset for the next batch of tracks
+    The playlist index is paged sequentially (each page is needed to find the
+    next), but the per-playlist track fetches are independent network-bound
+    requests, so they are dispatched concurrently on a small thread pool.
+    Extracts playlist name, track name, first artist name, and album name.
+
+    Args:
+        sp: An authenticated spotipy.Spotify client instance.
+
+    Returns:
+        list: A list of dictionaries, where each dictionary represents a playlist
+              and contains 'name' (playlist name) and 'tracks' (parallel field
+              lists {'names': [...], 'artists': [...], 'albums': [...]}).
+              Returns an empty list if no playlists are found or in case of an error.
+    """
+    all_playlists_data = []
+
+    logging.info("Starting to fetch Spotify playlists...")
+
+    try:
+        # Pass 1: collect the playlist names and IDs.
+        playlist_metas = _fetch_playlist_metas(sp)
 
+        # Pass 2: fetch each playlist's tracks concurrently. ex.map preserves
+        # input order, so the result matches the user's library ordering.
+        if playlist_metas:
+            with ThreadPoolExecutor(max_workers=SPOTIFY_FETCH_WORKERS) as ex:
+                track_lists = list(ex.map(
+                    lambda meta: _fetch_playlist_tracks(sp, meta[0], meta[1], meta[2]),
+                    playlist_metas
+                ))
+
+            for (playlist_name, playlist_id, _), tracks_data in zip(playlist_metas, track_lists):
                 # Add the playlist and its tracks to the main list
-                if tracks_data: # Only add playlist if it has tracks fetched successfully
+                if tracks_data['names']: # Only add playlist if it has tracks fetched successfully
                     all_playlists_data.append({
                         'name': playlist_name,
                         'id': playlist_id, # Also storing id for potential future use
                         'tracks': tracks_data
                     })
-                    logging.info(f"Finished fetching {len(tracks_data)} tracks for playlist '{playlist_name}'.")
+                    logging.info(f"Finished fetching {len(tracks_data['names'])} tracks for playlist '{playlist_name}'.")
                 else:
                     logging.info(f"No tracks fetched or added for playlist '{playlist_name}'.")
 
-
-            # Check if there are more playlists to fetch
-            if playlists_batch.get('next') is None:
-                logging.info("No more pages of playlists.")
-                break # Exit the outer loop if no more pages
-            else:
-                playlists_offset += playlists_limit # Increment offset for the next batch of playlists
-
     except spotipy.exceptions.SpotifyException as e:
         logging.error(f"A Spotify API error occurred during playlist fetching: {e}")
         # Depending on the error, you might want to return partial data or raise the exception
@@ -140,6 +603,199 @@ def fetch_spotify_playlists(sp: spotipy.Spotify):
     return all_playlists_data
 
 
+def _dumps_bytes(obj) -> bytes:
+    """Serializes an object to compact JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def fetch_spotify_playlists_streaming(sp: spotipy.Spotify, out_path: str = SPOTIFY_DATA_JSONL_FILE):
+    """
+    Fetches all playlists like fetch_spotify_playlists, but appends each one
+    to a JSON-Lines file as soon as its tracks are complete instead of
+    accumulating everything in memory.
+
+    Peak memory stays at O(one playlist), and a run that crashes partway
+    keeps every playlist fetched so far on disk. The file is opened in
+    append mode, so re-runs extend an existing dump rather than replacing it.
+
+    Args:
+        sp: An authenticated spotipy.Spotify client instance.
+        out_path: Path of the JSON-Lines file to append playlist records to.
+
+    Returns:
+        int: The number of playlists written to the file.
+    """
+    written = 0
+
+    logging.info(f"Starting streaming fetch of Spotify playlists to '{out_path}'...")
+
+    try:
+        playlist_metas = _fetch_playlist_metas(sp)
+
+        if playlist_metas:
+            with open(out_path, 'ab') as f:
+                # ex.map yields results lazily in input order, so each record
+                # is written as soon as its fetch completes.
+                with ThreadPoolExecutor(max_workers=SPOTIFY_FETCH_WORKERS) as ex:
+                    track_lists = ex.map(
+                        lambda meta: _fetch_playlist_tracks(sp, meta[0], meta[1], meta[2]),
+                        playlist_metas
+                    )
+                    for (playlist_name, playlist_id, _), tracks_data in zip(playlist_metas, track_lists):
+                        if not tracks_data['names']:
+                            logging.info(f"No tracks fetched or added for playlist '{playlist_name}'.")
+                            continue
+                        record = {
+                            'name': playlist_name,
+                            'id': playlist_id,
+                            'tracks': tracks_data
+                        }
+                        f.write(_dumps_bytes(record) + b'\n')
+                        f.flush() # Keep the record even if a later fetch crashes
+                        written += 1
+                        logging.info(f"Wrote {len(tracks_data['names'])} tracks for playlist '{playlist_name}'.")
+
+    except spotipy.exceptions.SpotifyException as e:
+        logging.error(f"A Spotify API error occurred during playlist fetching: {e}")
+    except IOError as e:
+        logging.error(f"Error writing to file {out_path}: {e}")
+    except Exception as e:
+        logging.error(f"An unexpected error occurred: {e}")
+
+    logging.info(f"Finished streaming fetch. Total playlists written: {written}")
+    return written
+
+
+def load_playlists_from_jsonl(filename: str = SPOTIFY_DATA_JSONL_FILE):
+    """
+    Lazily yields playlist records from a JSON-Lines file written by
+    fetch_spotify_playlists_streaming.
+
+    Yields one playlist dictionary at a time so callers can process a dump
+    much larger than memory. Malformed lines are logged and skipped.
+    """
+    if not os.path.exists(filename):
+        logging.warning(f"File {filename} not found. Nothing to yield.")
+        return
+
+    try:
+        with open(filename, 'rb') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    if orjson is not None:
+                        yield orjson.loads(line)
+                    else:
+                        yield json.loads(line)
+                except (json.JSONDecodeError, ValueError) as e:
+                    logging.error(f"Skipping malformed line {line_number} in {filename}: {e}")
+    except IOError as e:
+        logging.error(f"Error reading file {filename}: {e}")
+
+
+def _iter_track_pairs(tracks):
+    """
+    Yields (track_name, artist_name) pairs from a playlist's 'tracks' value.
+
+    Accepts both the structure-of-arrays shape written by current fetches
+    ({'names': [...], 'artists': [...], 'albums': [...]}) and the legacy
+    list-of-dicts shape, so data files produced by older versions still
+    transfer.
+    """
+    if isinstance(tracks, dict):
+        yield from zip(tracks.get('names', []), tracks.get('artists', []))
+    else:
+        for track in tracks:
+            yield track.get('name'), track.get('artist')
+
+
+def _load_transferred_ids(filename: str = TRANSFERRED_IDS_FILE) -> set:
+    """Loads the set of already-transferred Spotify playlist IDs."""
+    if not os.path.exists(filename):
+        return set()
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+    except IOError as e:
+        logging.error(f"Error reading file {filename}: {e}")
+        return set()
+
+
+# Serializes appends to the resume file; records are written from the add
+# pool's completion callbacks, which can fire on different worker threads.
+_transferred_ids_lock = threading.Lock()
+
+
+def _record_transferred_id(playlist_id: str, filename: str = TRANSFERRED_IDS_FILE):
+    """Appends a finished playlist's Spotify ID to the resume file."""
+    try:
+        with _transferred_ids_lock:
+            with open(filename, 'a', encoding='utf-8') as f:
+                f.write(playlist_id + '\n')
+    except IOError as e:
+        logging.error(f"Error writing to file {filename}: {e}")
+
+
+def _clear_transferred_ids(filename: str = TRANSFERRED_IDS_FILE):
+    """
+    Removes the resume file after a fully completed run.
+
+    The file only exists to let an interrupted run skip finished playlists;
+    once a run has processed every playlist, leaving it around would make
+    every later run skip everything, which defeats incremental re-syncs of
+    playlists that gained tracks on Spotify since.
+    """
+    try:
+        if os.path.exists(filename):
+            os.remove(filename)
+            logging.info(f"Cleared resume file {filename} after completed run.")
+    except OSError as e:
+        logging.error(f"Error removing file {filename}: {e}")
+
+
+def _make_add_completion_recorder(spotify_playlist_id: str, playlist_name: str,
+                                  num_chunks: int):
+    """
+    Returns a done-callback for one playlist's add-chunk futures.
+
+    The playlist is recorded as transferred only once all of its chunks
+    have completed, and only if every one of them succeeded. Recording at
+    submit time would let a crash during the add phase mark playlists as
+    done whose tracks were never actually added, which is exactly the case
+    the resume file exists for.
+    """
+    lock = threading.Lock()
+    state = {'remaining': num_chunks, 'all_ok': True}
+
+    def _on_chunk_done(future):
+        try:
+            ok = bool(future.result())
+        except Exception as e:
+            # _add_playlist_chunk catches its own errors; this guards
+            # against anything unexpected escaping the worker.
+            logging.error(f"Add chunk for '{playlist_name}' raised unexpectedly: {e}")
+            ok = False
+        with lock:
+            state['all_ok'] = state['all_ok'] and ok
+            state['remaining'] -= 1
+            finished = state['remaining'] == 0
+            all_ok = state['all_ok']
+        if not finished:
+            return
+        if all_ok:
+            if spotify_playlist_id != 'N/A':
+                _record_transferred_id(spotify_playlist_id)
+        else:
+            logging.warning(f"Not marking '{playlist_name}' as transferred: "
+                            f"one or more add batches failed. It will be retried on the next run.")
+
+    return _on_chunk_done
+
+
 def save_playlists_to_json(playlists_data: list, filename: str = SPOTIFY_DATA_FILE):
     """
     Saves the fetched Spotify playlist data to a JSON file.
@@ -151,8 +807,14 @@ def save_playlists_to_json(playlists_data: list, filename: str = SPOTIFY_DATA_FI
     """
     logging.info(f"Attempting to save playlist data to {filename}...")
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(playlists_data, f, ensure_ascii=False, indent=4)
+        if orjson is not None:
+            # orjson produces bytes directly; OPT_INDENT_2 keeps the file
+            # human-readable while staying far faster than stdlib json.
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(playlists_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(playlists_data, f, ensure_ascii=False, indent=4)
         logging.info(f"Successfully saved {len(playlists_data)} playlists to {filename}")
     except IOError as e:
         logging.error(f"Error writing to file {filename}: {e}")
@@ -160,10 +822,46 @@ def save_playlists_to_json(playlists_data: list, filename: str = SPOTIFY_DATA_FI
         logging.error(f"An unexpected error occurred while saving to JSON: {e}")
 
 
+def iter_playlists_from_json(filename: str = SPOTIFY_DATA_FILE):
+    """
+    Lazily yields playlist dictionaries from a JSON file.
+
+    When ijson is installed the top-level array is parsed incrementally, so
+    peak memory stays at one playlist regardless of dump size. Without
+    ijson the whole document is parsed at once (via orjson or stdlib json)
+    and then yielded item by item. Yields nothing if the file doesn't
+    exist or an error occurs during loading.
+    """
+    logging.info(f"Attempting to load playlist data from {filename}...")
+    if not os.path.exists(filename):
+        logging.warning(f"File {filename} not found. Nothing to yield.")
+        return
+
+    try:
+        if ijson is not None:
+            with open(filename, 'rb') as f:
+                yield from ijson.items(f, 'item')
+        elif orjson is not None:
+            with open(filename, 'rb') as f:
+                yield from orjson.loads(f.read())
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                yield from json.load(f)
+    except IOError as e:
+        logging.error(f"Error reading file {filename}: {e}")
+    except (json.JSONDecodeError, ValueError) as e:
+        logging.error(f"Error decoding JSON from file {filename}: {e}")
+    except Exception as e:
+        logging.error(f"An unexpected error occurred while loading from JSON: {e}")
+
+
 def load_playlists_from_json(filename: str = SPOTIFY_DATA_FILE) -> list:
     """
     Loads Spotify playlist data from a JSON file.
 
+    Kept for callers that want the whole dump in memory; the transfer path
+    iterates iter_playlists_from_json directly instead.
+
     Args:
         filename: The name of the file to load the data from.
                   Defaults to SPOTIFY_DATA_FILE.
@@ -172,25 +870,10 @@ def load_playlists_from_json(filename: str = SPOTIFY_DATA_FILE) -> list:
         A list of playlist dictionaries loaded from the file.
         Returns an empty list if the file doesn't exist or if an error occurs during loading.
     """
-    logging.info(f"Attempting to load playlist data from {filename}...")
-    if not os.path.exists(filename):
-        logging.warning(f"File {filename} not found. Returning empty list.")
-        return []
-
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            playlists_data = json.load(f)
+    playlists_data = list(iter_playlists_from_json(filename))
+    if playlists_data:
         logging.info(f"Successfully loaded {len(playlists_data)} playlists from {filename}")
-        return playlists_data
-    except IOError as e:
-        logging.error(f"Error reading file {filename}: {e}")
-        return []
-    except json.JSONDecodeError as e:
-        logging.error(f"Error decoding JSON from file {filename}: {e}")
-        return []
-    except Exception as e:
-        logging.error(f"An unexpected error occurred while loading from JSON: {e}")
-        return []
+    return playlists_data
 
 
 def transfer_playlists_to_ytmusic(yt: ytmusicapi.YTMusic, spotify_data_file: str = SPOTIFY_DATA_FILE) -> bool:
@@ -210,124 +893,198 @@ def transfer_playlists_to_ytmusic(yt: ytmusicapi.YTMusic, spotify_data_file: str
     """
     logging.info(f"Starting playlist transfer to YouTube Music from file: {spotify_data_file}")
 
-    # 1. Load Spotify data
-    spotify_playlists = load_playlists_from_json(filename=spotify_data_file)
-    if not spotify_playlists:
-        logging.error("No Spotify playlist data loaded. Aborting transfer.")
-        return False # Indicate that the process didn't start due to missing data
+    # 1. Load Spotify data lazily: the transfer only needs one playlist at a
+    # time, so the dump never has to fit in memory all at once.
+    spotify_playlists = iter_playlists_from_json(filename=spotify_data_file)
+    playlists_seen = 0 # Counts records yielded, since a generator has no len()
 
-    logging.info(f"Loaded {len(spotify_playlists)} playlists from Spotify data file.")
+    # Persistent search cache shared across playlists and across runs.
+    search_cache = _YTSearchCache()
 
-    # 2. Iterate through each Spotify playlist
-    for playlist in spotify_playlists:
-        playlist_name = playlist.get('name', 'Unnamed Spotify Playlist')
-        spotify_playlist_id = playlist.get('id', 'N/A') # Get Spotify ID for logging
-        logging.info(f"Processing Spotify playlist: '{playlist_name}' (ID: {spotify_playlist_id})")
+    # Long-lived pool for the add phase: chunked add calls for playlist N
+    # run here while the main loop already searches tracks for playlist N+1,
+    # so the pipeline never stalls on either phase.
+    add_pool = ThreadPoolExecutor(max_workers=YT_ADD_WORKERS)
+    add_futures = []
 
-        yt_playlist_id = None # Initialize YT playlist ID for this iteration
+    # Playlists finished in a previous (possibly interrupted) run are skipped.
+    transferred_ids = _load_transferred_ids()
+    if transferred_ids:
+        logging.info(f"Found {len(transferred_ids)} previously transferred playlists; they will be skipped.")
 
-        # 3. Create the corresponding playlist on YouTube Music
-        try:
-            logging.info(f"Creating YouTube Music playlist: '{playlist_name}'")
-            # Create playlist with a description indicating its origin
-            yt_playlist_id = yt.create_playlist(
-                title=playlist_name,
-                description=f"Migrated from Spotify playlist: {playlist_name} (ID: {spotify_playlist_id})"
-            )
-            logging.info(f"Successfully created YouTube Music playlist '{playlist_name}' with ID: {yt_playlist_id}")
-            time.sleep(1) # Short delay after creating a playlist
+    # Snapshot of the playlists already in the YT Music library, so re-runs
+    # reuse a same-named playlist instead of failing a create call for it.
+    existing_playlists = _get_existing_yt_playlists(yt)
+    if existing_playlists:
+        logging.info(f"Found {len(existing_playlists)} existing YouTube Music playlists; "
+                     f"same-named playlists will be reused.")
 
-        except Exception as e:
-            # This might happen if the playlist already exists or due to API errors
-            logging.error(f"Failed to create YouTube Music playlist '{playlist_name}'. Error: {e}")
-            # Decide whether to try finding an existing playlist or skip
-            # For simplicity, we'll skip this playlist for now if creation fails
-            logging.warning(f"Skipping playlist '{playlist_name}' due to creation error.")
-            time.sleep(2) # Wait a bit longer after an error
-            continue # Move to the next Spotify playlist
-
-        # 4. Find and collect track video IDs on YouTube Music
-        video_ids_to_add = []
-        tracks = playlist.get('tracks', [])
-        logging.info(f"Searching for {len(tracks)} tracks from '{playlist_name}' on YouTube Music...")
-
-        for i, track in enumerate(tracks):
-            track_name = track.get('name')
-            artist_name = track.get('artist')
-            # album_name = track.get('album') # Keep album name for potential future use
-
-            if not track_name or not artist_name:
-                logging.warning(f"Skipping track {i+1} in '{playlist_name}' due to missing name or artist.")
+    # Everything from here on runs under try/finally: an exception from
+    # the loop or the drain must still shut the add pool down and flush
+    # the batched cache writes, or worker threads and results leak.
+    try:
+        # 2. Iterate through each Spotify playlist
+        for playlist in spotify_playlists:
+            playlists_seen += 1
+            playlist_name = playlist.get('name', 'Unnamed Spotify Playlist')
+            spotify_playlist_id = playlist.get('id', 'N/A') # Get Spotify ID for logging
+
+            if spotify_playlist_id in transferred_ids:
+                logging.info(f"Skipping already-transferred playlist: '{playlist_name}' (ID: {spotify_playlist_id})")
                 continue
 
-            # Construct search query - simple name + artist is usually effective
-            query = f"{track_name} {artist_name}"
-            logging.debug(f"Searching YT Music for: '{query}'")
+            logging.info(f"Processing Spotify playlist: '{playlist_name}' (ID: {spotify_playlist_id})")
 
-            try:
-                # Search for the track primarily in 'songs'
-                search_results = yt.search(query, filter='songs', limit=5) # Limit results
+            yt_playlist_id = existing_playlists.get(playlist_name)
+            existing_video_ids = set() # Tracks already in the reused playlist, if any
 
-                found_video_id = None
-                if search_results:
-                    # Check the first few results for a likely match
-                    for result in search_results:
-                        if result.get('videoId') and result.get('resultType') == 'song':
-                            found_video_id = result['videoId']
-                            logging.info(f"  Found song match for '{query}': Video ID {found_video_id}")
-                            break # Use the first song result
+            # 3. Create the corresponding playlist on YouTube Music, unless a
+            # same-named one already exists in the library (typical on re-runs).
+            if yt_playlist_id is not None:
+                logging.info(f"Reusing existing YouTube Music playlist '{playlist_name}' (ID: {yt_playlist_id})")
+                # Fetch its current contents so only missing tracks are added
+                # (incremental re-sync instead of duplicating the playlist).
+                existing_video_ids = _get_playlist_video_ids(yt, yt_playlist_id)
+            else:
+                try:
+                    logging.info(f"Creating YouTube Music playlist: '{playlist_name}'")
+                    # Create playlist with a description indicating its origin
+                    yt_playlist_id = _call_with_backoff(
+                        yt.create_playlist,
+                        title=playlist_name,
+                        description=f"Migrated from Spotify playlist: {playlist_name} (ID: {spotify_playlist_id})"
+                    )
+                    logging.info(f"Successfully created YouTube Music playlist '{playlist_name}' with ID: {yt_playlist_id}")
+                    # Duplicate-named playlists later in the dump reuse this one.
+                    existing_playlists[playlist_name] = yt_playlist_id
 
-                # Fallback: If no song found, try searching videos
-                if not found_video_id:
-                    logging.warning(f"  No direct song match for '{query}'. Trying video search...")
-                    time.sleep(0.2) # Small delay before fallback search
-                    search_results_videos = yt.search(query, filter='videos', limit=5)
-                    if search_results_videos:
-                         for result in search_results_videos:
-                            # Prioritize official music videos if possible, otherwise take first video
-                            # This logic can be refined based on title matching etc.
-                            if result.get('videoId') and result.get('resultType') == 'video':
-                                found_video_id = result['videoId']
-                                logging.info(f"  Found video match for '{query}': Video ID {found_video_id}")
-                                break # Use the first video result
-
-                if found_video_id:
-                    if found_video_id not in video_ids_to_add: # Avoid duplicates within the same playlist add batch
-                         video_ids_to_add.append(found_video_id)
-                    else:
-                         logging.debug(f"  Video ID {found_video_id} already queued for addition.")
+                except Exception as e:
+                    # This might happen due to API errors
+                    logging.error(f"Failed to create YouTube Music playlist '{playlist_name}'. Error: {e}")
+                    # Decide whether to try finding an existing playlist or skip
+                    # For simplicity, we'll skip this playlist for now if creation fails
+                    logging.warning(f"Skipping playlist '{playlist_name}' due to creation error.")
+                    continue # Move to the next Spotify playlist
+
+            # 4. Find and collect track video IDs on YouTube Music
+            video_ids_to_add = []
+            track_pairs = list(_iter_track_pairs(playlist.get('tracks', [])))
+            logging.info(f"Searching for {len(track_pairs)} tracks from '{playlist_name}' on YouTube Music...")
+
+            # Build the search queries and cache keys up front, keeping track order.
+            queries = [] # (query, cache_key) pairs
+            for i, (track_name, artist_name) in enumerate(track_pairs):
+                if not track_name or not artist_name:
+                    logger.warning("Skipping track %d in '%s' due to missing name or artist.",
+                                   i + 1, playlist_name)
+                    continue
+
+                # Construct search query - simple name + artist is usually effective
+                queries.append((f"{track_name} {artist_name}", _normalize_cache_key(track_name, artist_name)))
+
+            # Resolve from the persistent cache first; only cache misses go to
+            # the network. resolved maps cache_key -> videoId ('' = known miss).
+            # to_search maps cache_key -> query, so a track repeated within the
+            # playlist (common on "liked songs" dumps) is searched exactly once.
+            resolved = {}
+            to_search = {}
+            for query, key in queries:
+                if key in resolved or key in to_search:
+                    continue # Duplicate track within this playlist
+                cached = search_cache.get(key)
+                if cached is not None:
+                    resolved[key] = cached
+                    logger.debug("  Cache hit for '%s': '%s'", query, cached or '<no match>')
                 else:
-                    logging.warning(f"  Could not find any match for track: '{query}' on YouTube Music.")
-
-            except Exception as e:
-                logging.error(f"Error searching for track '{query}': {e}")
-                # Continue to the next track even if one search fails
-
-            # Add a delay between track searches to avoid rate-limiting
-            time.sleep(0.6) # Increased sleep slightly based on experience
-
-        # 5. Add found tracks to the YouTube Music playlist
-        if video_ids_to_add:
-            logging.info(f"Adding {len(video_ids_to_add)} found tracks to YT Music playlist '{playlist_name}' (ID: {yt_playlist_id})...")
-            try:
-                # YTMusicAPI can sometimes fail if adding too many at once, though it handles batches.
-                # Consider chunking video_ids_to_add if adding hundreds/thousands fails.
-                status = yt.add_playlist_items(yt_playlist_id, video_ids_to_add)
-                logging.info(f"API response for adding tracks to '{playlist_name}': {status}")
-                if isinstance(status, dict) and 'status' in status and status['status'] == 'STATUS_SUCCEEDED':
-                     logging.info(f"Successfully added tracks to playlist '{playlist_name}'.")
+                    to_search[key] = query
+            if queries:
+                logging.info(f"{len(queries)} tracks: {len(resolved)} resolved from the "
+                             f"search cache, {len(to_search)} unique queries to search.")
+
+            # Dispatch the remaining searches onto a bounded worker pool. The
+            # searches are independent HTTPS round trips, so running them
+            # concurrently (with the global rate limiter pacing actual requests)
+            # collapses the wall time that used to be spent sleeping between
+            # sequential calls. ex.map preserves input order.
+            if to_search:
+                with ThreadPoolExecutor(max_workers=YT_SEARCH_WORKERS) as ex:
+                    search_results = list(ex.map(
+                        lambda q: _search_track_on_ytmusic(yt, q), to_search.values()))
+                for key, found_video_id in zip(to_search, search_results):
+                    if found_video_id is _SEARCH_FAILED:
+                        # The search errored rather than finding nothing; treat
+                        # the track as unmatched for this run only. Caching it
+                        # as a negative would suppress retries for a week.
+                        resolved[key] = ''
+                        continue
+                    resolved[key] = found_video_id or ''
+                    search_cache.put(key, found_video_id or '')
+
+            # Reassemble the playlist's video list in original track order.
+            # The seen set keeps the duplicate check O(1) per track; a linear
+            # `not in list` scan would be quadratic on large playlists. It is
+            # seeded with the reused playlist's current tracks so re-syncs only
+            # add what is missing.
+            seen_video_ids = set(existing_video_ids)
+            for query, key in queries:
+                found_video_id = resolved.get(key)
+                if not found_video_id:
+                    continue # Search failures are logged inside the worker
+                if found_video_id not in seen_video_ids: # Avoid duplicates within the same playlist add batch
+                    seen_video_ids.add(found_video_id)
+                    video_ids_to_add.append(found_video_id)
                 else:
-                     logging.warning(f"Potential issue adding tracks to '{playlist_name}'. Response: {status}")
+                    logger.debug("  Video ID %s already queued for addition.", found_video_id)
 
-            except Exception as e:
-                logging.error(f"Failed to add tracks to YT Music playlist '{playlist_name}' (ID: {yt_playlist_id}). Error: {e}")
-        else:
-            logging.info(f"No tracks were found or matched to add to YT Music playlist '{playlist_name}'.")
+            # 5. Add found tracks to the YouTube Music playlist, in chunks.
+            # The chunks are submitted to the shared add pool and run while the
+            # loop moves on to the next playlist's searches. The completion
+            # recorder marks the playlist as transferred only once all of its
+            # chunks have actually succeeded (see _make_add_completion_recorder).
+            if video_ids_to_add:
+                logging.info(f"Adding {len(video_ids_to_add)} found tracks to YT Music playlist "
+                             f"'{playlist_name}' (ID: {yt_playlist_id}) "
+                             f"in chunks of {YT_ADD_CHUNK_SIZE}...")
+                chunks = [video_ids_to_add[i:i + YT_ADD_CHUNK_SIZE]
+                          for i in range(0, len(video_ids_to_add), YT_ADD_CHUNK_SIZE)]
+                on_chunk_done = _make_add_completion_recorder(
+                    spotify_playlist_id, playlist_name, len(chunks))
+                for chunk in chunks:
+                    future = add_pool.submit(_add_playlist_chunk, yt, playlist_name, yt_playlist_id, chunk)
+                    future.add_done_callback(on_chunk_done)
+                    add_futures.append(future)
+            else:
+                logging.info(f"No tracks were found or matched to add to YT Music playlist '{playlist_name}'.")
+                # Nothing pending for this playlist, so it is complete as-is.
+                if spotify_playlist_id != 'N/A':
+                    _record_transferred_id(spotify_playlist_id)
+
+            # 6. Log completion of this playlist's coordination work
+            logging.info(f"Finished processing Spotify playlist: '{playlist_name}'")
+            logging.info("-" * 30) # Separator for clarity
+
+        # Bulk-flush phase: all (playlist, chunk) add calls were submitted to the
+        # shared pool as each playlist finished searching, so by now most have
+        # already run in parallel with later searches. Drain whatever is left;
+        # per-chunk outcomes are logged by the workers.
+        if add_futures:
+            logging.info(f"Waiting for {len(add_futures)} playlist add batches to finish...")
+            for done, future in enumerate(as_completed(add_futures), start=1):
+                future.result()
+                logger.debug("Add batch %d/%d finished.", done, len(add_futures))
+            logging.info("All playlist add batches finished.")
+    finally:
+        add_pool.shutdown()
+        search_cache.close() # Flush any uncommitted cache writes
+
+    if playlists_seen == 0:
+        logging.error("No Spotify playlist data loaded. Aborting transfer.")
+        return False # Indicate that the process didn't start due to missing data
 
-        # 6. Log completion for the current playlist and delay before the next one
-        logging.info(f"Finished processing Spotify playlist: '{playlist_name}'")
-        logging.info("-" * 30) # Separator for clarity
-        time.sleep(2) # Wait before processing the next playlist
+    # The run covered every playlist in the dump; drop the resume file so
+    # the next run re-syncs playlists incrementally instead of skipping
+    # them all. Playlists whose adds failed were never recorded in it.
+    _clear_transferred_ids()
 
     logging.info("Completed transfer process for all playlists.")
     return True # Indicate the process started and ran